@@ -11,5 +11,5 @@ for arg in "$@"; do
     fi
 done
 
-docker run --platform linux/amd64 --name evacuation-simulation -it -v "${PWD}"/workspace:/home/workspace $image "${args[@]}"
+docker run --platform linux/amd64 --name evacuation-simulation -it -e MAX_WORKERS -v "${PWD}"/workspace:/home/workspace $image "${args[@]}"
 find workspace/results/frames/ -type f -exec rm {} +
\ No newline at end of file
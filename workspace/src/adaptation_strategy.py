@@ -2,6 +2,7 @@
 This module contains the base class for adaptation strategies.
 """
 
+import functools
 import importlib
 import os
 import random
@@ -95,20 +96,44 @@ class AdaptationStrategy(object):
         Returns:
             An instance of the specified strategy. None if not found.
         """
+        strategy_class = AdaptationStrategy.find_strategy_class(strategy_name, strategies_folder)
         try:
-            for file_name in os.listdir(strategies_folder):
-                if file_name.endswith('.py') and file_name[:-3] == strategy_name:
-                    module = importlib.import_module('strategies.' + strategy_name)
-                    strategy_class = getattr(module, strategy_name)
-
-                    if issubclass(strategy_class, AdaptationStrategy):
-                        strategy_instance = strategy_class(scenario)
-                        return strategy_instance
+            if strategy_class is not None:
+                return strategy_class(scenario)
         except Exception as e:
             AdaptationStrategy.logger.error(f"Error in get_adaptation_strategy: {e}")
             traceback.print_exc()
         raise FileNotFoundError(f"Failed to get adaptation strategy {strategy_name}")
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def find_strategy_class(strategy_name: str,
+                            strategies_folder: str = STRATEGIES_FOLDER) -> Optional[type]:
+        """
+        Returns the class of the specified adaptation strategy.
+
+        The lookup is cached, so the strategy file is checked and the module is imported
+        only once for each strategy, instead of once for every scenario using it.
+
+        Args:
+            strategy_name: The name of the strategy.
+            strategies_folder: The folder containing the strategy files.
+
+        Returns:
+            The strategy class. None if not found.
+        """
+        try:
+            if os.path.isfile(os.path.join(strategies_folder, strategy_name + '.py')):
+                module = importlib.import_module('strategies.' + strategy_name)
+                strategy_class = getattr(module, strategy_name)
+
+                if issubclass(strategy_class, AdaptationStrategy):
+                    return strategy_class
+        except Exception as e:
+            AdaptationStrategy.logger.error(f"Error in get_adaptation_strategy: {e}")
+            traceback.print_exc()
+        return None
+
     def __init__(self, scenario) -> None:
         self.scenario = scenario
         if scenario.netlogo_params.seed != 0:
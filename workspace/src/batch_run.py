@@ -10,7 +10,9 @@ https://github.com/projectmesa/mesa
 """
 
 import itertools
-from typing import Any, Iterable, Mapping, Union
+from typing import Any, Iterable, Iterator, Mapping, Union
+
+import numpy as np  # type: ignore
 
 ParametersType = Mapping[str, Union[Any, Iterable[Any]]]
 
@@ -20,6 +22,12 @@ from utils.helper import setup_logger
 
 logger = setup_logger()
 
+# The types of the parameter values that hold the values to iterate in a batch run
+ITERABLE_PARAMETER_TYPES = (list, tuple, range, set, frozenset, dict, np.ndarray)
+
+# Translation table to replace the underscores in the scenario names
+SCENARIO_NAME_TRANSLATION = str.maketrans("_", "-")
+
 
 def _create_scenario_name(scenario: Scenario, kwargs: dict[str, Any]) -> str:
     """
@@ -32,35 +40,37 @@ def _create_scenario_name(scenario: Scenario, kwargs: dict[str, Any]) -> str:
     Returns:
         A name for the scenario based on the parameters.
     """
-    name = scenario.name + "@" + ''.join(
-        [f"{key}={value}$" for key, value in kwargs.items()])
-    name = name.replace("_", "-")[:-1]
-    return name
+    name = scenario.name
+    if kwargs:
+        name += "@" + "$".join(f"{key}={value}" for key, value in kwargs.items())
+    return name.translate(SCENARIO_NAME_TRANSLATION)
 
 
-def _build_kwargs(parameters: ParametersType) -> list[dict[str, Any]]:
+def _build_kwargs(parameters: ParametersType) -> Iterator[dict[str, Any]]:
     """
-    Build a list of dictionaries with all the different combinations of parameters.
+    Build the dictionaries with all the different combinations of parameters.
+
+    The combinations are generated lazily, one at a time, instead of building them all upfront.
 
     Args:
         parameters: A dictionary of parameters to iterate and their respective range of values.
 
-    Returns:
-        A list of dictionaries with different combinations of parameters.
+    Yields:
+        A dictionary with a different combination of parameters.
     """
-    # Holds lists of tuples, where each tuple is a parameter name its value
-    parameter_list: list[list[tuple[str, Any]]] = []
+    # The names of the parameters to iterate, and their respective values
+    keys: list[str] = []
+    values_list: list[Iterable[Any]] = []
     for param, values in parameters.items():
         if param == "enable_video":
             continue
-        if isinstance(values, Iterable) and not isinstance(values, str):
-            all_values: list[tuple[str, Any]] = [(param, value) for value in values]
-            parameter_list.append(all_values)
+        if isinstance(values, ITERABLE_PARAMETER_TYPES):
+            keys.append(param)
+            values_list.append(values)
 
-    all_kwargs: Iterable[tuple[tuple[str, Any]]] = itertools.product(*parameter_list)
-    kwargs_list: list[dict[str, Any]] = [dict(kwargs) for kwargs in all_kwargs]
-    logger.debug(f"kargs_list: {kwargs_list}")
-    return kwargs_list
+    logger.debug(f"Building combinations of parameters: {keys}")
+    for combination in itertools.product(*values_list):
+        yield dict(zip(keys, combination))
 
 
 def batch_run(scenario: Scenario, parameters: ParametersType, num_samples: int) -> list[Scenario]:
@@ -90,17 +100,17 @@ def batch_run(scenario: Scenario, parameters: ParametersType, num_samples: int)
     for key in keys:
         if not (hasattr(scenario, key) or hasattr(scenario.netlogo_params, key)):
             raise ValueError(f"Parameter {key} not in scenario")
+    # The keys that are set on the scenario, the rest are set on its NetLogo parameters
+    scenario_keys = frozenset(key for key in keys if hasattr(scenario, key))
 
     scenarios: list[Scenario] = []
-    kwargs_list: list[dict[str, Any]] = _build_kwargs(parameters)
-
-    for kwargs in kwargs_list:
+    for kwargs in _build_kwargs(parameters):
         new_scenario = scenario.duplicate()
         new_scenario.name = _create_scenario_name(scenario, kwargs)
         new_scenario.netlogo_params.num_of_samples = num_samples
 
         for key, value in kwargs.items():
-            if hasattr(new_scenario, key):
+            if key in scenario_keys:
                 setattr(new_scenario, key, value)
                 if key == "adaptation_strategy":
                     new_scenario.adaptation_strategy = \
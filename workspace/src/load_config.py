@@ -4,20 +4,19 @@ and creating Scenario objects.
 """
 
 import copy
+import functools
 import json
 import os
-from typing import Any, Iterable
+from typing import Any
 
 import numpy as np  # type: ignore
-from src.batch_run import batch_run
+from src.batch_run import ITERABLE_PARAMETER_TYPES, batch_run
 from src.simulation import Scenario
 from utils.helper import convert_dict_to_snake_case, setup_logger
 from utils.paths import CONFIG_FILE, NETLOGO_FOLDER, NETLOGO_HOME
 
 logger = setup_logger()
 
-CONFIG: dict[str, Any] | None = None
-
 
 def _load_json_file(config_file_path: str) -> dict[str, Any]:
     """
@@ -65,7 +64,9 @@ def _get_params_from(config: dict[str, Any]) -> dict[str, Any]:
             raise KeyError(f"Missing key in configuration file: {key}")
 
     netlogo_model_path = os.path.join(NETLOGO_HOME, NETLOGO_FOLDER, config['netlogoModelName'])
-    if not os.path.exists(netlogo_model_path):
+    try:
+        os.stat(netlogo_model_path)
+    except OSError:
         raise IOError(f"NetLogo model path does not exist: {netlogo_model_path}")
     config['netlogoModelPath'] = netlogo_model_path
 
@@ -97,28 +98,48 @@ def _get_params_from(config: dict[str, Any]) -> dict[str, Any]:
     return config
 
 
-def load_config(config_file_path: str) -> dict[str, Any]:
+@functools.lru_cache(maxsize=8)
+def _load_checked_config(config_file_path: str, modification_time_ns: int) -> dict[str, Any]:
     """
-    Loads the specified JSON configuration file.
+    Loads and checks the specified JSON configuration file.
+
+    The result is cached for each path and modification time of the file, so the file is parsed
+    again only when it changes.
 
     Args:
         config_file_path: The path to the JSON configuration file.
+        modification_time_ns: The modification time of the file, in nanoseconds.
 
     Returns:
         The configuration dictionary.
     """
-    global CONFIG
-    if CONFIG:
-        return CONFIG
-
     config = _load_json_file(config_file_path)
     config = _get_params_from(config)
 
-    CONFIG = config
     logger.debug('Config checked and loaded.')
     return config
 
 
+def load_config(config_file_path: str) -> dict[str, Any]:
+    """
+    Loads the specified JSON configuration file.
+
+    The configuration dictionary is shared between the calls for the same file,
+    and should not be modified.
+
+    Args:
+        config_file_path: The path to the JSON configuration file.
+
+    Returns:
+        The configuration dictionary.
+    """
+    try:
+        modification_time_ns = os.stat(config_file_path).st_mtime_ns
+    except OSError:
+        raise IOError(f"Configuration file not found. Path given: {config_file_path}")
+    return _load_checked_config(config_file_path, modification_time_ns)
+
+
 def get_max_time() -> int:
     """
     Returns the maximum simulation time from the configuration file.
@@ -166,19 +187,15 @@ def _has_iterable_values(parameters: dict[str, Any]) -> bool:
     """
     Checks if a value of the parameters is iterable.
 
+    The ranges should be replaced with lists first, with _check_for_range.
+
     Args:
         parameters: A dictionary of parameters to iterate and their respective range of values.
 
     Returns:
         True if a value is iterable, False otherwise.
     """
-    _check_for_range(parameters)
-
-    for value in parameters.values():
-        if isinstance(value, Iterable) and not isinstance(value, str):
-            return True
-
-    return False
+    return any(isinstance(value, ITERABLE_PARAMETER_TYPES) for value in parameters.values())
 
 
 def load_scenarios(config: dict[str, Any]) -> list[Scenario]:
@@ -198,16 +215,17 @@ def load_scenarios(config: dict[str, Any]) -> list[Scenario]:
     scenarios = []
 
     list_of_scenarios: list[dict[str, Any]] = config['simulationScenarios']
+    # The global params are shared by all the scenarios, so they are converted only once
+    global_params: dict[str, Any] = convert_dict_to_snake_case(config['scenarioParams'])
     for scenario_dict in list_of_scenarios:
-        global_params: dict[str, Any] = config['scenarioParams']
         scenario_obj = Scenario()
         # Scenario params override global params
-        scenario_params = {**global_params, **scenario_dict}
-        scenario_params = convert_dict_to_snake_case(scenario_params)
+        scenario_params = global_params | convert_dict_to_snake_case(scenario_dict)
         # no need for it as all scenarios in the list are enabled
         scenario_params.pop('enabled')
         scenario_obj.update(scenario_params)
 
+        _check_for_range(scenario_params)
         if _has_iterable_values(scenario_params):
             logger.debug(f"Building scenarios for {scenario_obj.name} with iterable values.")
             batch = batch_run(scenario_obj, scenario_params, scenario_params['num_of_samples'])
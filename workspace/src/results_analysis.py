@@ -9,6 +9,8 @@ function to calculate Cohen's d for independent samples
 Inspired by: https://machinelearningmastery.com/effect-size-measures-in-python/
 """
 
+import math
+import os
 import textwrap
 
 import matplotlib  # type: ignore
@@ -23,13 +25,21 @@ import seaborn as sns  # type: ignore
 import statsmodels.api as sm  # type: ignore
 from scipy.stats import mannwhitneyu  # type: ignore
 from src.load_config import get_target_scenario
-from src.simulation import Simulation
+from src.simulation import RESULTS_DTYPES
 from utils.helper import setup_logger
-from utils.paths import RESULTS_CSV_FILE_NAME, RESULTS_FOLDER
+from utils.paths import RESULTS_CSV_FILE_NAME, RESULTS_FEATHER_FILE_NAME, RESULTS_FOLDER
 
 PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+# Largest sample size for which scipy may use the exact Mann-Whitney U distribution
+EXACT_TEST_MAX_SAMPLE_SIZE = 8
+# Extracts the index from a simulation id, the part between the first and second "_"
+SIM_INDEX_PATTERN = r'^[^_]*_([^_]*)'
+# Also save the violin plots as eps, much slower to write than png for large samples
+SAVE_EPS = False
 
 logger = setup_logger()
+# Power analysis shared by all the sample size calculations, as statsmodels does for tt_solve_power
+T_TEST_POWER_ANALYSIS = sm.stats.TTestIndPower()
 
 
 def cohen_d_from_metrics(mean_1: float, mean_2: float, std_dev_1: float, std_dev_2: float) -> float:
@@ -48,8 +58,14 @@ def cohen_d_from_metrics(mean_1: float, mean_2: float, std_dev_1: float, std_dev
     Returns:
         The Cohen's d effect size.
     """
-    pooled_std_dev = np.sqrt((std_dev_1 ** 2 + std_dev_2 ** 2) / 2)
-    return (mean_1 - mean_2) / pooled_std_dev
+    # math.sqrt works on the floats directly, without the overhead of a numpy scalar
+    pooled_std_dev = math.sqrt((std_dev_1 * std_dev_1 + std_dev_2 * std_dev_2) / 2)
+    mean_difference = mean_1 - mean_2
+    # Samples without variance, e.g. a single simulation per scenario. Same results as the
+    # numpy division: an infinite effect size, or nan if the means are also equal
+    if pooled_std_dev == 0:
+        return math.copysign(math.inf, mean_difference) if mean_difference else math.nan
+    return mean_difference / pooled_std_dev
 
 
 def calculate_sample_size(mean_1: float, mean_2: float, std_dev_1: float, std_dev_2: float,
@@ -71,53 +87,124 @@ def calculate_sample_size(mean_1: float, mean_2: float, std_dev_1: float, std_de
     Returns:
         The recommended sample size for each group.
     """
-    analysis: sm.stats.TTestIndPower = sm.stats.TTestIndPower()
     effect_size = cohen_d_from_metrics(mean_1, mean_2, std_dev_1, std_dev_2)
     # If the results are identical, the effect size will be 0
     if effect_size == 0:
         return 0
-    result = analysis.solve_power(effect_size=effect_size,
-                                  alpha=alpha,
-                                  power=power,
-                                  alternative="two-sided")
+    result = T_TEST_POWER_ANALYSIS.solve_power(effect_size=effect_size,
+                                               alpha=alpha,
+                                               power=power,
+                                               alternative="two-sided")
     return result
 
 
+def mann_whitney_u_tests(first_scenario_column: str,
+                         other_scenario_columns: list[str],
+                         results_dataframe: pd.DataFrame,
+                         alternative: str = "two-sided") -> list[tuple[float, float]]:
+    """
+    Perform a Mann-Whitney U test between the first sample and each of the other samples.
+
+    For larger samples, all the tests are computed with a single vectorised call, by broadcasting
+    the first sample against a matrix that has one of the other samples in each row. Smaller
+    samples are tested one pair at a time, because scipy chooses a single method for the whole
+    batch, and ties in one pair would make every pair fall back to the asymptotic method.
+
+    Args:
+        first_scenario_column: The name of the column containing the first sample.
+        other_scenario_columns: The names of the columns containing the other samples.
+        results_dataframe: The DataFrame containing the sample data.
+        alternative: The alternative hypothesis, either "two-sided", "less", or "greater".
+                     Defaults to "two-sided".
+
+    Returns:
+        A list with the U statistic and the p value of each test,
+        in the order of other_scenario_columns.
+    """
+    first_scenario_data = np.ascontiguousarray(results_dataframe[first_scenario_column],
+                                               dtype=np.float64)
+    other_scenarios_data = np.ascontiguousarray(
+        results_dataframe[other_scenario_columns].to_numpy(dtype=np.float64).T)
+
+    if min(first_scenario_data.shape[-1],
+           other_scenarios_data.shape[-1]) <= EXACT_TEST_MAX_SAMPLE_SIZE:
+        # Let scipy choose the exact or asymptotic method for each pair on its own
+        return [(float(u), float(p_value))
+                for u, p_value in (mannwhitneyu(x=first_scenario_data, y=other_scenario_data,
+                                                alternative=alternative)
+                                   for other_scenario_data in other_scenarios_data)]
+
+    # For larger samples scipy always uses the asymptotic method, setting it skips the ties check
+    u, p_values = mannwhitneyu(x=first_scenario_data[np.newaxis, :], y=other_scenarios_data,
+                               alternative=alternative, axis=-1, method="asymptotic")
+    return list(zip(np.atleast_1d(u).tolist(), np.atleast_1d(p_values).tolist()))
+
+
+def get_sample_statistics(results_dataframe: pd.DataFrame) -> dict[str, tuple[float, float, int]]:
+    """
+    Calculates the mean, standard deviation and size of the sample in each column.
+
+    All the columns are computed with a single pass, so that the statistics of a sample that is
+    compared against many others are not recomputed for every test.
+
+    Args:
+        results_dataframe: The DataFrame containing the sample data.
+
+    Returns:
+        A dictionary with the mean, standard deviation and size of each column's sample.
+    """
+    data = results_dataframe.to_numpy(dtype=np.float64)
+    # Passing the mean to np.std saves it a second pass over the data to compute it again
+    means = np.mean(data, axis=0, keepdims=True)
+    stddevs = np.std(data, axis=0, mean=means)
+    return {column: (mean, stddev, len(data))
+            for column, mean, stddev in zip(results_dataframe.columns,
+                                            means[0].tolist(), stddevs.tolist())}
+
+
 def test_hypothesis(first_scenario_column: str,
                     second_scenario_column: str,
                     results_dataframe: pd.DataFrame,
-                    experiment_folder_path: str,
-                    alternative: str = "two-sided",) -> None:
+                    alternative: str = "two-sided",
+                    test_result: Optional[tuple[float, float]] = None,
+                    sample_statistics: Optional[dict[str, tuple[float, float, int]]] = None
+                    ) -> str:
     """
     Perform a Mann-Whitney U test to compare the distributions of two samples.
 
     This function calculates the means, standard deviations, and recommended sample sizes for the
     two samples, then performs a Mann-Whitney U test to determine if the distributions are
-    significantly different. The results are printed to the console and also saved to a file.
+    significantly different. The results are printed to the console and also returned, so they
+    can be saved to a file.
 
     Args:
         first_scenario_column: The name of the column containing the first sample.
         second_scenario_column: The name of the column containing the second sample.
         results_dataframe: The DataFrame containing the sample data.
-        experiment_folder_path: The path to the experiments folder.
         alternative: The alternative hypothesis, either "two-sided", "less", or "greater".
                      Defaults to "two-sided".
-    """
-
-    first_scenario_data = results_dataframe[first_scenario_column].values
-    first_scenario_mean = np.mean(first_scenario_data).item()
-    first_scenario_stddev = np.std(first_scenario_data).item()
+        test_result: The U statistic and p value of the test, if already computed
+                     with mann_whitney_u_tests.
+        sample_statistics: The mean, standard deviation and size of the samples, if already
+                           computed with get_sample_statistics.
 
-    second_scenario_data = results_dataframe[second_scenario_column].values
-    second_scenario_mean = np.mean(second_scenario_data).item()
-    second_scenario_stddev = np.std(second_scenario_data).item()
+    Returns:
+        The result of the test, as it should be written to the hypothesis tests file.
+    """
+    if sample_statistics is None:
+        sample_statistics = get_sample_statistics(
+            results_dataframe[[first_scenario_column, second_scenario_column]])
+    first_scenario_mean, first_scenario_stddev, first_scenario_size = \
+        sample_statistics[first_scenario_column]
+    second_scenario_mean, second_scenario_stddev, second_scenario_size = \
+        sample_statistics[second_scenario_column]
 
     logger.info("{}->mean = {} std = {} len={}".format(
         first_scenario_column, first_scenario_mean,
-        first_scenario_stddev, len(first_scenario_data)))
+        first_scenario_stddev, first_scenario_size))
     logger.info("{}->mean = {} std = {} len={}".format(
         second_scenario_column, second_scenario_mean,
-        second_scenario_stddev, len(second_scenario_data)))
+        second_scenario_stddev, second_scenario_size))
     logger.info("Recommended Sample size: {}".format(
         calculate_sample_size(first_scenario_mean, second_scenario_mean, first_scenario_stddev,
                               second_scenario_stddev)))
@@ -135,28 +222,20 @@ def test_hypothesis(first_scenario_column: str,
     )
 
     threshold = 0.05
-    u, p_value = mannwhitneyu(x=first_scenario_data, y=second_scenario_data,
-                              alternative=alternative)
+    if test_result is None:
+        test_result = mann_whitney_u_tests(first_scenario_column, [second_scenario_column],
+                                           results_dataframe, alternative)[0]
+    u, p_value = test_result
     logger.info("U={} , p={}".format(u, p_value))
 
-    hypothesis_file_path = experiment_folder_path + "hypothesis_tests.txt"
     if p_value > threshold:
         logger.info("FAILS TO REJECT NULL HYPOTHESIS: {}".format(null_hypothesis))
-        # save the results
-        with open(hypothesis_file_path, "a") as f:
-            f.write(f"p value: {p_value}\n")
-            f.write("FAILS TO REJECT NULL HYPOTHESIS: {}\n".format(null_hypothesis))
-            f.write(alternative_hypothesis)
-            f.write("\n")
+        conclusion = "FAILS TO REJECT NULL HYPOTHESIS: {}".format(null_hypothesis)
     else:
         logger.info("REJECT NULL HYPOTHESIS: {}".format(null_hypothesis))
         logger.info(alternative_hypothesis)
-        # save the results
-        with open(hypothesis_file_path, "a") as f:
-            f.write(f"p value: {p_value}\n")
-            f.write("REJECT NULL HYPOTHESIS: {}\n".format(null_hypothesis))
-            f.write(alternative_hypothesis)
-            f.write("\n")
+        conclusion = "REJECT NULL HYPOTHESIS: {}".format(null_hypothesis)
+    return f"p value: {p_value}\n{conclusion}\n{alternative_hypothesis}\n"
 
 
 def get_metrics(experiment_results: pd.DataFrame) -> pd.DataFrame:
@@ -182,27 +261,29 @@ def plot_results(data_for_violin: dict[str, pd.DataFrame], img_folder: str) -> N
         data_for_violin: A dictionary containing the data to plot and name of the column.
         img_folder: The path to the image folder.
     """
+    plt.style.use(PLOT_STYLE)
+    violin_width = 4
     for name, violin_data in data_for_violin.items():
         if len(violin_data.columns) > 20:
             continue
-        violin_width = 4
         total_fig_width = len(violin_data.columns) * violin_width
-        plt.style.use(PLOT_STYLE)
-        plt.figure(figsize=(total_fig_width, 10))
+        # Work on the figure directly, instead of through the global state of pyplot
+        fig, ax = plt.subplots(figsize=(total_fig_width, 10))
         plt_path = img_folder + name + "_violin_plot"
 
         means = violin_data.mean().sort_values(ascending=False)
         sorted_violin_data = violin_data[means.index]
 
-        ax = sns.violinplot(data=sorted_violin_data, order=None)
+        sns.violinplot(data=sorted_violin_data, order=None, ax=ax)
         ax.set_title(f"{name.capitalize()} Comparison")
         locs = ax.get_xticks()
         labels = [textwrap.fill(label.get_text(), 30) for label in ax.get_xticklabels()]
         ax.xaxis.set_major_locator(plt.FixedLocator(locs))
         ax.set_xticklabels(labels, ha='center')
-        plt.savefig(plt_path + ".png", bbox_inches='tight', pad_inches=0)
-        plt.savefig(plt_path + ".eps", bbox_inches='tight', pad_inches=0)
-        plt.clf()
+        fig.savefig(plt_path + ".png", bbox_inches='tight', pad_inches=0)
+        if SAVE_EPS:
+            fig.savefig(plt_path + ".eps", bbox_inches='tight', pad_inches=0)
+        plt.close(fig)
 
 
 def process_data(experiment_data: pd.DataFrame, column: str, data_folder: str) -> pd.DataFrame:
@@ -220,11 +301,19 @@ def process_data(experiment_data: pd.DataFrame, column: str, data_folder: str) -
     Returns:
         processed_data: DataFrame with ticks grouped by scenario.
     """
-    # Split 'simulation_id' to extract the simulation number
-    experiment_data['sim_index'] = experiment_data['simulation_id'].apply(Simulation.get_index)
-    # Pivot the DataFrame using 'sim_index' as the new index
-    processed_data = experiment_data.pivot_table(
-        index='sim_index', columns=column, values='evacuation_ticks', aggfunc='mean')
+    # Split 'simulation_id' to extract the simulation number, once for all the groupings
+    if 'sim_index' not in experiment_data.columns:
+        # Same as Simulation.get_index, but as a single vectorised pass over the column
+        sim_index = experiment_data['simulation_id'].str.extract(SIM_INDEX_PATTERN, expand=False)
+        if sim_index.isna().any():
+            simulation_id = experiment_data['simulation_id'][sim_index.isna()].iloc[0]
+            raise ValueError(f"simulation_id must contain an underscore ('_'). {simulation_id}")
+        experiment_data['sim_index'] = sim_index
+    # Pivot the DataFrame using 'sim_index' as the new index, with a groupby instead of
+    # pivot_table which goes through a more general and slower path for the same result
+    processed_data = (experiment_data.groupby(['sim_index', column])['evacuation_ticks']
+                      .mean().unstack(column)
+                      .dropna(axis=1, how='all').dropna(how='all'))
 
     processed_data_path = data_folder + column + "_processed_data.csv"
     processed_data.to_csv(processed_data_path)
@@ -248,19 +337,23 @@ def plot_robot_actions(data: pd.DataFrame, img_folder: str) -> None:
     # Replace NaN with 'NoStrategy'
     data['strategy'] = data['strategy'].fillna('NoStrategy')
     strategies = data['strategy'].unique()
-    true_counts = []
-    false_counts = []
-    call_staff_counts = []
     # count the number of times each strategy appears in the data and store it a dictionary
     strategy_counts = data['strategy'].value_counts().reindex(strategies).to_dict()
 
-    # Data Preparation
-    for strategy in strategies:
-        strategy_data = data[data['strategy'] == strategy]
-        true_counts.append(strategy_data['robot_responses'].apply(lambda x: 'true' in x).sum())
-        false_counts.append(strategy_data['robot_responses'].apply(lambda x: 'false' in x).sum())
-        call_staff_counts.append(
-            strategy_data['robot_actions'].apply(lambda x: 'call-staff' in x).sum())
+    # Data Preparation, flag each simulation once and sum the flags of each strategy.
+    # The lists are loaded back as their string representation, so the flags are vectorised
+    # substring checks instead of a python lambda per row
+    robot_responses = data['robot_responses'].astype(str).str
+    robot_actions = data['robot_actions'].astype(str).str
+    action_counts = pd.DataFrame({
+        'strategy': data['strategy'],
+        'true': robot_responses.contains('true', regex=False),
+        'false': robot_responses.contains('false', regex=False),
+        'call_staff': robot_actions.contains('call-staff', regex=False),
+    }).groupby('strategy', sort=False).sum().reindex(strategies)
+    true_counts = action_counts['true'].tolist()
+    false_counts = action_counts['false'].tolist()
+    call_staff_counts = action_counts['call_staff'].tolist()
 
     # Plotting
     x = range(len(strategies))  # the label locations
@@ -283,7 +376,7 @@ def plot_robot_actions(data: pd.DataFrame, img_folder: str) -> None:
     ax.legend()
     fig.tight_layout()
     plt.savefig(plt_path)
-    plt.clf()
+    plt.close(fig)
 
 
 def plot_comparisons(experiment_data: pd.DataFrame, img_folder: str) -> None:
@@ -335,6 +428,7 @@ def plot_comparisons(experiment_data: pd.DataFrame, img_folder: str) -> None:
                 plt.legend(title=other_column)
                 plt.savefig(plt_path, bbox_inches='tight', pad_inches=0)
                 plt.clf()
+            plt.close()
 
     # for each parameter with a unique value, plot the evacuation_ticks for each strategy
     strategies_df = experiment_data['strategy'].str.split('@', expand=True)
@@ -356,7 +450,37 @@ def plot_comparisons(experiment_data: pd.DataFrame, img_folder: str) -> None:
         plt.title(f"Evacuation Ticks vs {column} (strategy)")
         plt.legend(title='strategy')
         plt.savefig(plt_path, bbox_inches='tight', pad_inches=0)
-        plt.clf()
+        plt.close()
+
+
+def load_experiment_data(data_folder_path: str) -> pd.DataFrame:
+    """
+    Loads the data of all the simulations of an experiment.
+
+    The feather file is preferred as it is much faster to read, the csv file is used
+    for experiments saved without it.
+
+    Args:
+        data_folder_path: The path to the data folder of the experiment.
+
+    Returns:
+        DataFrame with all simulations' data.
+    """
+    feather_results_path = data_folder_path + RESULTS_FEATHER_FILE_NAME
+    if os.path.isfile(feather_results_path):
+        try:
+            return pd.read_feather(feather_results_path)
+        except Exception as e:
+            logger.warning(f"Could not read {feather_results_path}, falling back to csv: {e}")
+
+    csv_results_path = data_folder_path + RESULTS_CSV_FILE_NAME
+    try:
+        # The multithreaded pyarrow parser is several times faster than the default one
+        return pd.read_csv(csv_results_path, index_col=0, engine='pyarrow',
+                           dtype=RESULTS_DTYPES)
+    except (ImportError, ValueError) as e:
+        logger.warning(f"Could not read {csv_results_path} with pyarrow: {e}")
+    return pd.read_csv(csv_results_path, index_col=0, dtype=RESULTS_DTYPES)
 
 
 def perform_analysis(experiment_folder: dict[str, str],
@@ -373,14 +497,15 @@ def perform_analysis(experiment_folder: dict[str, str],
         experiment_folder_path = RESULTS_FOLDER + folder_name + '/'
         imgs_folder_path = experiment_folder_path + 'img/'
         data_folder_path = experiment_folder_path + 'data/'
-        csv_results_path = data_folder_path + RESULTS_CSV_FILE_NAME
     else:
         experiment_folder_path = experiment_folder['path']
         imgs_folder_path = experiment_folder['img']
         data_folder_path = experiment_folder['data']
-        csv_results_path = experiment_folder['data'] + RESULTS_CSV_FILE_NAME
 
-    experiment_data = pd.read_csv(csv_results_path)
+    experiment_data = load_experiment_data(data_folder_path)
+    if experiment_data.empty:
+        logger.warning(f"No simulation results in {data_folder_path}, skipping the analysis.")
+        return
     scenario_processed_data = process_data(experiment_data, 'scenario', data_folder_path)
     strategy_processed_data = process_data(experiment_data, 'strategy', data_folder_path)
 
@@ -393,13 +518,25 @@ def perform_analysis(experiment_folder: dict[str, str],
     target_scenario = get_target_scenario()
     scenarios = scenario_processed_data.columns.to_list()
     if target_scenario in scenarios:
-        for alternative_scenario in scenarios:
-            if alternative_scenario != target_scenario:
-                test_hypothesis(first_scenario_column=target_scenario,
-                                second_scenario_column=alternative_scenario,
-                                results_dataframe=scenario_processed_data,
-                                experiment_folder_path=experiment_folder_path,
-                                alternative="less")
+        alternative_scenarios = [scenario for scenario in scenarios
+                                 if scenario != target_scenario]
+        test_results = []
+        sample_statistics = get_sample_statistics(scenario_processed_data)
+        if alternative_scenarios:
+            test_results = mann_whitney_u_tests(target_scenario, alternative_scenarios,
+                                                scenario_processed_data, alternative="less")
+        hypothesis_tests = [
+            test_hypothesis(first_scenario_column=target_scenario,
+                            second_scenario_column=alternative_scenario,
+                            results_dataframe=scenario_processed_data,
+                            alternative="less",
+                            test_result=test_result,
+                            sample_statistics=sample_statistics)
+            for alternative_scenario, test_result in zip(alternative_scenarios, test_results)]
+        # All the results are saved at once, instead of opening the file for every test
+        if hypothesis_tests:
+            with open(experiment_folder_path + "hypothesis_tests.txt", "a") as f:
+                f.writelines(hypothesis_tests)
     else:
         logger.error(
             f"Cannot test. Scenario: '{target_scenario}' for analysis not in simulationScenarios," +
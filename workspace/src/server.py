@@ -6,7 +6,7 @@ import signal
 import sys
 import traceback
 from multiprocessing import Lock
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from flask import Flask, request  # type: ignore
 
@@ -15,45 +15,34 @@ sys.path.append(workspace_path)
 
 from utils.cleanup import signal_handler
 
+if TYPE_CHECKING:
+    from src.simulation import Scenario, Simulation
+
 PORT = 5000
 BASE_URL = f'http://localhost:{PORT}'
 
-# List of scenario objects
-SCENARIOS = []
-# Tracks the simulation IDs that have not finished yet
-UNFINISHED_SIMULATION_IDS: set[str] = set()
+# Index of the scenario and simulation objects by simulation ID
+SIMULATIONS_BY_ID: dict[str, tuple[Scenario, Simulation]] = {}
 
 app = Flask(__name__)
 
 lock = Lock()
 
 
-@app.route('/get_unfinished_simulations', methods=['GET'])
-def get_unfinished_simulations():
+def find_simulation(simulation_id: str) -> tuple[Scenario, Simulation]:
     """
-    Returns a list of simulation IDs that have not finished yet.
-    """
-    return {"ids": list(UNFINISHED_SIMULATION_IDS)}, 200
+    Returns the scenario and simulation objects of a simulation ID.
 
+    Args:
+        simulation_id: The ID of the simulation to find.
 
-@app.route('/put_results', methods=['PUT'])
-def put_results():
-    """
-    Updates the results of a simulation in the corresponding simulation object.
-    Called when the simulation ends.
+    Returns:
+        The Scenario and Simulation objects.
     """
-    from src.simulation import Simulation
-
-    data = request.json
-    simulation_id = data['simulation_id']
-
-    global UNFINISHED_SIMULATION_IDS
-    with lock:
-        UNFINISHED_SIMULATION_IDS.remove(simulation_id)
-        simulation: Simulation = Simulation.find_by_id(SCENARIOS, simulation_id)
-        simulation.result.update(data)
-
-    return "Results saved", 200
+    try:
+        return SIMULATIONS_BY_ID[simulation_id]
+    except KeyError:
+        raise NameError(f"No matching simulation found for ID {simulation_id}")
 
 
 @app.route('/passenger_response', methods=['POST'])
@@ -61,14 +50,12 @@ def passenger_response():
     """
     Save the response of a passenger when asked to help in the corresponding simulation object.
     """
-    from src.simulation import Simulation
-
     data = request.json
     simulation_id: str = data["simulation_id"]
     response: str = data["response"]
 
+    _, simulation = find_simulation(simulation_id)
     with lock:
-        simulation: Simulation = Simulation.find_by_id(SCENARIOS, simulation_id)
         simulation.add_response(response)
 
     return "Response saved", 200
@@ -81,7 +68,6 @@ def on_survivor_contact_handler():
     Calls the get_robot_action method of the adaptation strategy to return the robot's action.
     """
     from src.adaptation_strategy import Survivor
-    from src.simulation import Scenario, Simulation
     from utils.helper import setup_logger
 
     logger = setup_logger()
@@ -93,10 +79,8 @@ def on_survivor_contact_handler():
     first_responder_victim_distance = float(data["staff_fallen_distance"])
     simulation_id = data["simulation_id"]
 
-    logger.debug(f'PUT /on_survivor_contact called by {simulation_id}')
-    scenario_name = Simulation.get_scenario_name(simulation_id)
-    scenario: Scenario = Scenario.find_by_name(scenario_name, SCENARIOS)
-    simulation: Simulation = Simulation.find_by_id(scenario, simulation_id)
+    logger.debug('PUT /on_survivor_contact called by %s', simulation_id)
+    scenario, simulation = find_simulation(simulation_id)
 
     if scenario.adaptation_strategy is None:
         raise ValueError("No adaptation strategy provided.")
@@ -131,13 +115,9 @@ def start():
         with open(file_path, 'w') as file:
             json.dump(config, file, indent=5)
 
-        global SCENARIOS
-        SCENARIOS = scenarios
-
-        global UNFINISHED_SIMULATION_IDS
-        for scenario in scenarios:
-            for simulation in scenario.simulations:
-                UNFINISHED_SIMULATION_IDS.add(simulation.id)
+        global SIMULATIONS_BY_ID
+        SIMULATIONS_BY_ID = {simulation.id: (scenario, simulation)
+                             for scenario in scenarios for simulation in scenario.simulations}
 
         # Run the experiments, and saves the results
         start_experiments(config, scenarios, experiment_folder)
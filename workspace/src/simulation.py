@@ -12,16 +12,32 @@ Classes:
 from __future__ import annotations
 
 import random
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 import pandas as pd  # type: ignore
 from src.adaptation_strategy import AdaptationStrategy
 from utils.helper import convert_camelCase_to_snake_case, setup_logger
 
+# Types of the results columns that hold None for the simulations without a result,
+# so they are numeric in every file the results are saved to and loaded from
+RESULTS_DTYPES = {'evacuation_ticks': 'float64', 'evacuation_time': 'float64'}
+
 
 class Updatable(object):
+    __slots__ = ()
     logger = setup_logger()
 
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the object's attributes as a dictionary.
+
+        Returns:
+            A new dictionary with the attributes, in the order they are defined.
+        """
+        if hasattr(self, '__dict__'):
+            return dict(self.__dict__)
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def update(self, params: dict) -> None:
         """
         Updates the object's parameters that are in the provided dictionary.
@@ -53,6 +69,11 @@ class NetLogoParams(Updatable):
     - room_type: The type of room in the simulation.
     - enable_video: Whether to enable video recording of the simulation.
     """
+    # Slots instead of a __dict__ for each of the many instances, one for every simulation
+    __slots__ = ('seed', 'netlogo_seed', 'num_of_samples', 'num_of_robots', 'num_of_passengers',
+                 'num_of_staff', 'fall_length', 'fall_chance', 'robot_persuasion_factor',
+                 'max_netlogo_ticks', 'room_type', 'enable_video')
+
     def __init__(self):
         self.seed = 0
         self.netlogo_seed = None
@@ -69,7 +90,7 @@ class NetLogoParams(Updatable):
 
     def duplicate(self):
         new_obj = NetLogoParams()
-        new_obj.update(self.__dict__)
+        new_obj.update(self.to_dict())
         return new_obj
 
 
@@ -86,6 +107,9 @@ class Result(Updatable):
     - robot_contacts: The number of fallen victims the robot made contact with.
     - success: Whether the simulation was successful (finished on time and no errors).
     """
+    __slots__ = ('evacuation_ticks', 'evacuation_time', 'robot_actions', 'robot_responses',
+                 'robot_contacts', 'success', 'netlogo_seed')
+
     def __init__(self,
                  netlogo_seed: int = 0,
                  evacuation_ticks: Optional[int] = None,
@@ -164,7 +188,7 @@ class Scenario(Updatable):
         new_scenario.adaptation_strategy = self.adaptation_strategy
         new_scenario.simulations = self.simulations[:]
         new_scenario.results = self.results[:]
-        new_scenario.netlogo_params.update(self.netlogo_params.__dict__)
+        new_scenario.netlogo_params.update(self.netlogo_params.to_dict())
         # update the adaptation strategy scenario attribute to the new scenario
         if new_scenario.adaptation_strategy:
             new_scenario.adaptation_strategy.scenario = new_scenario
@@ -237,17 +261,25 @@ class Scenario(Updatable):
         Returns:
             A DataFrame containing the scenario data.
         """
-        params = self.netlogo_params.__dict__
+        # The params are a copy, so renaming the seed does not modify the scenario's NetLogoParams
+        params = self.netlogo_params.to_dict()
         # rename for clarity
-        params['param_seed'] = params['seed']
-        del params['seed']
-        info = {'scenario': self.name, 'strategy': self.adaptation_strategy}
-
-        scenario_data = []
-        for simulation in self.simulations:
-            result = simulation.result.__dict__
-
-            scenario_data.append({"simulation_id": simulation.id, **info, **params, **result})
+        params['param_seed'] = params.pop('seed')
+        number_of_simulations = len(self.simulations)
+
+        # Build the DataFrame column by column, instead of a dictionary for each simulation.
+        # The results' values override the params with the same name, as they did when merged
+        scenario_data: dict[str, list] = {
+            'simulation_id': [simulation.id for simulation in self.simulations],
+            'scenario': [self.name] * number_of_simulations,
+            'strategy': [self.adaptation_strategy] * number_of_simulations,
+        }
+        for key, value in params.items():
+            scenario_data[key] = [value] * number_of_simulations
+        results = [simulation.result.to_dict() for simulation in self.simulations]
+        if results:
+            for key in results[0]:
+                scenario_data[key] = [result[key] for result in results]
 
         return pd.DataFrame(scenario_data)
 
@@ -266,6 +298,8 @@ class Simulation(Updatable):
     - seed: The seed used for the simulation.
     - netlogo_seed: The seed used in NetLogo for the simulation.
     """
+    __slots__ = ('scenario_name', 'index', 'id', 'netlogo_params', 'result', 'seed',
+                 'netlogo_seed')
 
     @staticmethod
     def get_scenario_name(simulation_id: str) -> str:
@@ -273,7 +307,7 @@ class Simulation(Updatable):
         Extracts the scenario name from a simulation ID.
 
         This function takes a simulation ID as input and returns the scenario name
-        by splitting the ID on the "_" character and returning the first part.
+        by partitioning the ID on the first "_" character and returning the first part.
 
         Args:
             simulation_id: The simulation ID.
@@ -281,9 +315,10 @@ class Simulation(Updatable):
         Returns:
             The scenario name.
         """
-        if "_" not in simulation_id:
+        scenario_name, separator, _ = simulation_id.partition("_")
+        if not separator:
             raise ValueError(f"simulation_id must contain an underscore ('_'). {simulation_id}")
-        return simulation_id.split("_")[0]
+        return scenario_name
 
     @staticmethod
     def get_index(simulation_id: str) -> str:
@@ -291,7 +326,7 @@ class Simulation(Updatable):
         Extracts the scenario index from a simulation ID.
 
         This function takes a simulation ID as input and returns the scenario index
-        by splitting the ID on the "_" character and returning the second part.
+        by partitioning the ID on the "_" character and returning the second part.
 
         Args:
             simulation_id: The simulation ID.
@@ -299,9 +334,10 @@ class Simulation(Updatable):
         Returns:
             The scenario index.
         """
-        if "_" not in simulation_id:
+        _, separator, index = simulation_id.partition("_")
+        if not separator:
             raise ValueError(f"simulation_id must contain an underscore ('_'). {simulation_id}")
-        return simulation_id.split("_")[1]
+        return index.partition("_")[0]
 
     @staticmethod
     def generate_id(scenario_name: str, index: int) -> str:
@@ -406,4 +442,4 @@ class Simulation(Updatable):
         accepted_responses = ["true", AdaptationStrategy.CALL_STAFF_ROBOT_ACTION]
         if action_or_response in accepted_responses:
             self.result.robot_contacts += 1
-            self.logger.debug(f"Contact with fallen victim: {self.result.robot_contacts}")
+            self.logger.debug("Contact with fallen victim: %s", self.result.robot_contacts)
@@ -5,21 +5,24 @@ It provides functionality to run simulations and save the results.
 It uses the pyNetLogo library, to configure simulation parameters and retrieve simulation results.
 """
 
+import os
+import random
 import signal
 import time
-from multiprocessing import Pool, Process, Queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import Value
+from multiprocessing.sharedctypes import Synchronized
 from typing import Any, Optional
 
 import pandas as pd  # type: ignore
 import pyNetLogo
-import requests
 from pyNetLogo import NetLogoException
 from src.load_config import get_max_time
-from src.server import BASE_URL
-from src.simulation import NetLogoParams, Result, Scenario, Simulation
+from src.simulation import RESULTS_DTYPES, NetLogoParams, Result, Scenario, Simulation
 from tqdm import tqdm  # type: ignore
-from utils.helper import (PBar, TimeoutException, get_available_cpus,
-                          print_dots, setup_logger, timeout_handler)
+from utils.helper import PBar, TimeoutException, get_available_cpus, setup_logger
 from utils.netlogo_commands import *
 from utils.paths import *
 from utils.video_generation import generate_video
@@ -27,21 +30,52 @@ from utils.video_generation import generate_video
 logger = setup_logger()
 
 SIMULATION_TIMEOUT = get_max_time()
+# Times the workers are replaced after one of them dies, before giving up on the simulations
+MAX_EXECUTOR_RESTARTS = 3
+# Maximum number of ticks NetLogo runs per call while running a simulation
+NETLOGO_TICKS_STRIDE = 10
+# The JVM of each worker runs on a single pinned core, so it sizes its GC and JIT threads for one.
+# The serial GC needs no GC threads and a small initial heap speeds up the start of the JVM.
+NETLOGO_JVM_ARGS = ['-XX:ActiveProcessorCount=1', '-XX:+UseSerialGC', '-Xms128m']
+# Times a simulation is run when NetLogo fails, before it is recorded as unsuccessful
+NETLOGO_MAX_ATTEMPTS = 2
+
+
+@dataclass(frozen=True)
+class SimulationTask:
+    """
+    The data a worker process needs to run a simulation.
 
+    Only this small immutable payload is pickled and sent to the workers,
+    instead of the simulation and its parameters objects.
 
-def execute_commands(simulation_id: str,
-                     netlogo_params: NetLogoParams,
-                     netlogo_link: pyNetLogo.NetLogoLink) -> None:
+    Attributes:
+    - simulation_id: The simulation id in the form of <scenario_indx>.
+    - seed: The seed for the simulation. To be used in Netlogo to create a random seed.
+    - max_netlogo_ticks: The maximum number of NetLogo ticks to run the simulation.
+    - setup_script: The NetLogo commands that clear the environment and set up the global
+                    model parameters, joined in a single script.
     """
-    Executes NetLogo commands to setup global model parameters in NetLogo.
+    simulation_id: str
+    seed: int
+    max_netlogo_ticks: int
+    setup_script: str
 
-    Each parameter is mapped to a NetLogo command and executed.
-    The process is performed before the initail simulation setup.
+
+def build_setup_script(simulation_id: str, netlogo_params: NetLogoParams) -> str:
+    """
+    Builds the NetLogo script that clears the environment and sets up global model
+    parameters in NetLogo.
+
+    Each parameter is mapped to a NetLogo command. All the commands are joined in a single
+    script, so they are executed with a single call to NetLogo.
 
     Args:
         simulation_id: The simulation id in the form of <scenario_indx>.
         netlogo_params: The parameters to be set in NetLogo.
-        netlogo_link: The NetLogo link object.
+
+    Returns:
+        The NetLogo script.
     """
     commands = {
         SET_SIMULATION_ID_COMMAND: simulation_id,
@@ -54,47 +88,64 @@ def execute_commands(simulation_id: str,
         SET_FRAME_GENERATION_COMMAND: "TRUE" if netlogo_params.enable_video else "FALSE",
         SET_ROOM_ENVIRONMENT_TYPE: netlogo_params.room_type
     }
+    return "\n".join([CLEAR_COMMAND] +
+                     [command.format(value) for command, value in commands.items()])
 
-    try:
-        for command, value in commands.items():
-            netlogo_link.command(command.format(value))
-            logger.debug(f"{simulation_id}: Executed {command.format(value)}")
 
+def execute_commands(simulation_id: str,
+                     setup_script: str,
+                     netlogo_link: pyNetLogo.NetLogoLink) -> None:
+    """
+    Clears the environment and executes NetLogo commands to setup global model
+    parameters in NetLogo.
+
+    The process is performed before the initail simulation setup.
+
+    Args:
+        simulation_id: The simulation id in the form of <scenario_indx>.
+        setup_script: The NetLogo script, created by build_setup_script.
+        netlogo_link: The NetLogo link object.
+
+    Raises:
+        NetLogoException: If NetLogo fails, so the worker reloads the model
+                          and runs the simulation again.
+    """
+    try:
+        netlogo_link.command(setup_script)
+        logger.debug("%s: Executed %s", simulation_id, setup_script)
+    except NetLogoException as e:
+        logger.error(f"Commands failed in NetLogo for id: {simulation_id}. Exception: {e}")
+        raise
     except Exception as e:
         logger.error(f"Commands failed for id: {simulation_id}. Exception: {e}")
-    logger.debug(f"Commands executed for id: {simulation_id}")
+    logger.debug("Commands executed for id: %s", simulation_id)
 
 
-def setup_simulation(simulation_id: str,
-                     simulation_seed: int,
-                     simulation_params: NetLogoParams,
+def setup_simulation(simulation_task: SimulationTask,
                      netlogo_link: pyNetLogo.NetLogoLink) -> int:
     """
     Prepares the simulation.
 
-    Clears the environment in NetLogo, executes the commands using the parameters provided
-    and calls the set-up function of the NetLogo model.
+    Clears the environment in NetLogo and executes the commands of the simulation in a
+    single call, then seeds the simulation and calls the set-up function of the NetLogo
+    model in a second one.
 
     Args:
-        simulation_id: The simulation id in the form of <scenario_indx>.
-        simulation_seed: The seed for the simulation.
-        simulation_params: The parameters to be set in NetLogo.
+        simulation_task: The simulation to set up.
         netlogo_link: The NetLogo link object.
 
     Returns:
         current_seed: The seed used by netlogo for the simulation.
     """
-    logger.debug(f'Setting up simulation for id: {simulation_id}.')
-    netlogo_link.command('clear')
-
-    logger.debug(f'Cleared environment for id: {simulation_id}')
-    execute_commands(simulation_id, simulation_params, netlogo_link)
+    simulation_id = simulation_task.simulation_id
+    logger.debug('Setting up simulation for id: %s.', simulation_id)
+    execute_commands(simulation_id, simulation_task.setup_script, netlogo_link)
 
-    current_seed: int = int(netlogo_link.report(SEED_SIMULATION_REPORTER.format(simulation_seed)))
-    logger.debug(f"Simulation {simulation_id},  Current seed: {current_seed}")
-
-    netlogo_link.command('setup')
-    logger.debug(f"Setup completed for id: {simulation_id}")
+    # Seeds the simulation and calls setup in the same call
+    current_seed: int = int(netlogo_link.report(
+        SETUP_SIMULATION_REPORTER.format(simulation_task.seed)))
+    logger.debug("Simulation %s,  Current seed: %s", simulation_id, current_seed)
+    logger.debug("Setup completed for id: %s", simulation_id)
 
     return current_seed
 
@@ -112,7 +163,8 @@ def initialise_netlogo_link(netlogo_model_path: str) -> pyNetLogo.NetLogoLink:
     logger.debug("Initialising NetLogo link from model path: %s", netlogo_model_path)
     netlogo_link: pyNetLogo.NetLogoLink = pyNetLogo.NetLogoLink(netlogo_home=NETLOGO_HOME,
                                                                 netlogo_version=NETLOGO_VERSION,
-                                                                gui=False)
+                                                                gui=False,
+                                                                jvmargs=NETLOGO_JVM_ARGS)
     netlogo_link.load_model(netlogo_model_path)
     return netlogo_link
 
@@ -131,190 +183,295 @@ def _run_netlogo_model(netlogo_link: pyNetLogo.NetLogoLink, max_netlogo_ticks,
 
     Returns:
         evacuation_ticks: The number of ticks it took for the evacuation to finish, or None.
+
+    Raises:
+        NetLogoException: If NetLogo fails, so the worker reloads the model
+                          and runs the simulation again.
     """
     evacuation_ticks = None
+    # Checked between NetLogo calls, a SIGALRM handler would not run during them either
+    deadline = time.monotonic() + time_limit
     try:
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(time_limit)
         ticks = 0
-        while not netlogo_link.report(EVACUATION_FINISHED_REPORTER) and ticks < max_netlogo_ticks:
-            netlogo_link.command('go')
-            ticks += 1
+        # NetLogo checks if the evacuation finished before every tick, running up to a stride
+        # of ticks per call. Fewer ticks than requested means the evacuation finished.
+        while ticks < max_netlogo_ticks:
+            if time.monotonic() > deadline:
+                raise TimeoutException
+            stride = min(NETLOGO_TICKS_STRIDE, max_netlogo_ticks - ticks)
+            ticks_run = int(netlogo_link.report(GO_TICKS_REPORTER.format(stride)))
+            ticks += ticks_run
+            if ticks_run < stride:
+                break
         evacuation_ticks = ticks if ticks < max_netlogo_ticks else None
-        signal.alarm(0)
     except TimeoutException:
         logger.warning("Simulation timed out!")
     except NetLogoException as e:
         logger.error(f"NetLogo exception: {e}")
+        raise
     # ! cannot catch the exception in the java environment
     except BaseException as e:
         logger.error(f"Exception: {e}")
-    finally:
-        signal.alarm(0)
     return evacuation_ticks
 
 
-def run_simulation(simulation_id: str,
-                   simulation_seed: int,
-                   simulation_params: NetLogoParams,
+def run_simulation(simulation_task: SimulationTask,
                    netlogo_link: pyNetLogo.NetLogoLink) -> Result:
     """
-    Runs a single simulation with the provided parameters and returns the results.
+    Runs a single simulation and returns the results.
 
     Sets up the simulation using Neltlogo commands,
     calculates the execution time, generates a video if applicable and
     creates and returns a Result object.
 
     Args:
-        simulation_id: The simulation id in the form of <scenario_indx>.
-        simulation_seed: The seed for the simulation. To be used in Netlogo to create a random seed.
-        simulation_params: The parameters to be set in NetLogo.
+        simulation_task: The simulation to run.
         neltogo_link: The link to the NetLogo model.
 
     Returns:
         result: The result object containing the simulation results.
     """
     start_time = time.time()
-    current_seed: int = setup_simulation(simulation_id, simulation_seed, simulation_params,
-                                         netlogo_link)
+    current_seed: int = setup_simulation(simulation_task, netlogo_link)
     evacuation_ticks: Optional[int] = _run_netlogo_model(netlogo_link,
-                                                         simulation_params.max_netlogo_ticks)
+                                                         simulation_task.max_netlogo_ticks)
     endtime = time.time()
     evacuation_time = round(endtime - start_time, 2)
 
     success: bool = evacuation_ticks is not None and \
-        evacuation_ticks < simulation_params.max_netlogo_ticks
+        evacuation_ticks < simulation_task.max_netlogo_ticks
     return Result(netlogo_seed=current_seed,
                   evacuation_ticks=evacuation_ticks,
                   evacuation_time=evacuation_time,
                   success=success)
 
 
-def batch_processor(simulation_batch: list[dict[str, Any]], netlogo_model_path: str,
-                    index: int, q: Queue) -> None:
+# The NetLogo link of the current worker process. Set once by the executor initializer and
+# reused for every simulation the worker runs.
+worker_netlogo_link: Optional[pyNetLogo.NetLogoLink] = None
+worker_netlogo_model_path: Optional[str] = None
+
+
+def pin_worker_to_cpu(worker_counter: Synchronized) -> None:
     """
-    Used to run a batch of simulations in a dedicated Process.
+    Pins the current worker process to one of the CPUs available to the process.
 
-    It runs the simulations in the batch sequentially. It loads the netlogo model and
-    runs each simulation before killing the link.
+    Each worker of an executor takes the next CPU, so the workers and the threads of their JVMs
+    do not migrate across cores. The workers of an executor are never replaced and there are
+    no more of them than CPUs, so no two of them share a core. Each executor gets a new counter.
+    Only supported on Linux, elsewhere the worker is not pinned.
 
     Args:
-        simulation_batch: A list of dictionaries containing the simulation id, seed and parameters.
-        netlogo_model_path: The path to the NetLogo model.
-        index: The index of the current batch.
-        q: The queue to track the progress of the simulations.
-    """
-    netlogo_link = initialise_netlogo_link(netlogo_model_path)
-
-    for simulation in simulation_batch:
-        result = run_simulation(simulation['id'],
-                                simulation['seed'],
-                                simulation['params'],
-                                netlogo_link)
-        # update the queue to indicate that the simulation has finished to the progress bar
-        q.get()
-        # Convert result object to dict excluding keys that start with robot_ as they are
-        # updated from the server. ie 'robot_actions', 'robot_responses', 'robot_contacts'
-        data = {key: value for key, value in result.__dict__.items()
-                if not key.startswith('robot_')}
-        data['simulation_id'] = simulation['id']
+        worker_counter: Counter shared by the workers of the executor, to number them.
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker_index % len(cpus)]})
+    except OSError as e:
+        logger.error(f"Failed to pin worker to a CPU. Exception: {e}")
+
+
+def init_worker(netlogo_model_path: str, worker_counter: Optional[Synchronized] = None) -> None:
+    """
+    Initialises a worker process of the simulations executor.
+
+    Resets the signal handlers inherited from the server, pins the worker to a CPU and
+    loads the NetLogo model once per worker, so the cost of starting the JVM and loading
+    the model is paid only once and not for every simulation.
 
-        url = BASE_URL + "/put_results"
-        requests.put(url, json=data)
-        logger.debug(f"Simulation id: {simulation['id']} finished. - Result: {result}.")
+    Args:
+        netlogo_model_path: The path to the NetLogo model.
+        worker_counter: Counter shared by the workers of the executor, to pin them to CPUs.
+                        The worker is not pinned if not provided.
+    """
+    global worker_netlogo_link, worker_netlogo_model_path
+    # Workers are forked from the server and inherit its cleanup handlers. Ctrl+C is handled
+    # by the server alone, and SIGTERM, sent when the executor is broken, must just end the worker.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if worker_counter is not None:
+        pin_worker_to_cpu(worker_counter)
+    worker_netlogo_model_path = netlogo_model_path
+    try:
+        worker_netlogo_link = initialise_netlogo_link(netlogo_model_path)
+    except Exception as e:
+        # An exception in an executor initializer breaks the executor and fails all its simulations.
+        logger.error(f"Failed to initialise NetLogo link in worker. Exception: {e}")
 
-    logger.debug(f"Finished batch {index + 1}")
-    netlogo_link.kill_workspace()
 
+def reload_worker_netlogo_link() -> None:
+    """
+    Kills the NetLogo workspace of the current worker and loads the model again.
 
-def build_batches(simulations: list[Simulation], num_cpus: int) -> list[list[dict[str, Any]]]:
+    The workspace is kept alive between simulations and each simulation clears it during
+    its setup. Reloading is only used to recover after NetLogo fails.
     """
-    Builds batches of simulations to be executed in parallel.
+    global worker_netlogo_link
+    if worker_netlogo_link is not None:
+        try:
+            worker_netlogo_link.kill_workspace()
+        except Exception as e:
+            logger.error(f"Failed to kill NetLogo workspace. Exception: {e}")
+        worker_netlogo_link = None
+    init_worker(worker_netlogo_model_path)
 
-    It splits the list of simulations into batches and creates a list of dictionaries
-    containing the simulation id, seed and parameters for each simulation in each batch.
-    Objects are not passed by reference to the Process, but by value. This is why the
-    simulations are converted to dictionaries.
 
-    [[ {id: 1, seed: 123, params: {num_of_robots: 10, ...}}, ...], ...]
+def simulation_worker(simulation_task: SimulationTask) -> tuple[str, Optional[dict[str, Any]]]:
+    """
+    Runs a single simulation in a worker process of the executor and returns its results
+    through the executor to the parent process.
+
+    If NetLogo fails, the worker reloads the model and runs the simulation again, up to
+    NETLOGO_MAX_ATTEMPTS times. The simulations are seeded, so one that keeps failing would
+    fail every time, and it is recorded as unsuccessful instead.
+    If the simulation fails otherwise, no results are returned and the simulation is run again
+    in the next iteration of the simulations pool.
 
     Args:
-        simulations: The simulations to be batched.
-        num_cpus: The number of CPUs available.
+        simulation_task: The simulation to run.
 
     Returns:
-        simulation_batches: The list of simulation batches.
+        The simulation id and the results of the simulation, or None if it failed.
     """
-    # Initialize an empty list for each CPU
-    simulation_batches: list[list] = [[] for _ in range(num_cpus)]
-    simulations_dict = [{'id': sim.id, 'seed': sim.seed, 'params': sim.netlogo_params}
-                        for sim in simulations]
+    simulation_id = simulation_task.simulation_id
+    try:
+        for attempt in range(1, NETLOGO_MAX_ATTEMPTS + 1):
+            if worker_netlogo_link is None:
+                raise RuntimeError("NetLogo link is not initialised.")
+            try:
+                result = run_simulation(simulation_task, worker_netlogo_link)
+                logger.debug("Simulation id: %s finished. - Result: %s.", simulation_id, result)
+                break
+            except NetLogoException as e:
+                logger.error(f"Simulation id: {simulation_id} failed in NetLogo "
+                             f"(attempt {attempt} of {NETLOGO_MAX_ATTEMPTS}). Exception: {e}")
+                reload_worker_netlogo_link()
+        else:
+            logger.error(f"Simulation id: {simulation_id} recorded as unsuccessful.")
+            result = Result(success=False)
 
-    used_cores = set()
-    # Assign simulations to CPUs
-    for i, simulation in enumerate(simulations_dict):
-        cpu_index = i % num_cpus
-        simulation_batches[cpu_index].append(simulation)
-        used_cores.add(cpu_index)
-    # remove empty lists
-    simulation_batches = [batch for batch in simulation_batches if batch]
-    total_bathes_len = sum(len(batch) for batch in simulation_batches)
-    logger.info(
-        f"Total number of simulations to run: {total_bathes_len}. Total cores: {len(used_cores)}")
-    return simulation_batches
+        # Convert result object to dict excluding keys that start with robot_ as they are
+        # updated from the server. ie 'robot_actions', 'robot_responses', 'robot_contacts'
+        data = {key: value for key, value in result.to_dict().items()
+                if not key.startswith('robot_')}
+        return simulation_id, data
+    except Exception as e:
+        logger.error(f"Simulation id: {simulation_id} failed. Exception: {e}")
+    return simulation_id, None
+
+
+def build_simulation_tasks(simulations: list[Simulation]) -> list[SimulationTask]:
+    """
+    Builds the tasks for the simulations to be executed in parallel.
 
+    Objects are not passed by reference to the worker processes, but pickled and sent
+    by value. This is why each simulation is converted to a task with just its id, seed,
+    maximum ticks and the NetLogo setup script formatted with its parameters.
 
-def execute_parallel_simulations(simulations: list[Simulation], netlogo_model_path: str) -> None:
+    Args:
+        simulations: The simulations to be executed.
+
+    Returns:
+        simulation_tasks: The list of simulation tasks.
+    """
+    return [SimulationTask(simulation_id=sim.id,
+                           seed=sim.seed,
+                           max_netlogo_ticks=sim.netlogo_params.max_netlogo_ticks,
+                           setup_script=build_setup_script(sim.id, sim.netlogo_params))
+            for sim in simulations]
+
+
+def execute_parallel_simulations(simulations: list[Simulation],
+                                 netlogo_model_path: str) -> set[str]:
     """
     Executes the simulations in parallel using the available CPUs.
 
-    It creates a Process for each core and runs (total simulations / number of cores) simulations
-    in each, using the parameters from each Simulation object.
+    It creates a ProcessPoolExecutor with a worker for each core and submits all the
+    simulations to it. Each worker loads the NetLogo model once and then picks up the next
+    simulation as soon as it finishes the previous one, so a slow simulation does not hold
+    back the rest of the cores.
+    If a worker dies, the executor is broken. It is then replaced and the unfinished
+    simulations are submitted again, up to MAX_EXECUTOR_RESTARTS times, after which they
+    are recorded as unsuccessful.
+    The results come back through the executor and are saved in the simulation objects.
 
     Args:
         simulations: The simulations to be executed.
         netlogo_model_path: The path to the NetLogo model.
+
+    Returns:
+        finished_simulation_ids: The ids of the finished simulations, including the ones
+                                 recorded as unsuccessful.
     """
     num_cpus = get_available_cpus()
-    simulation_batches = build_batches(simulations, num_cpus)
-    logger.info(f"Setting up {len(simulations)} Simulations")
-    # Create a queue to track the progress of the simulations
-    q = Queue()
-    for _ in simulations:
-        q.put(1)
+    simulation_tasks = build_simulation_tasks(simulations)
+    # Mix the scenarios, so the slow ones are not all left for the end of the run.
+    # A separate generator leaves the global one, seeded for the strategies, untouched.
+    random.Random().shuffle(simulation_tasks)
+    total = len(simulation_tasks)
+    finished_simulation_ids: set[str] = set()
+    if not total:
+        return finished_simulation_ids
+    simulations_by_id = {simulation.id: simulation for simulation in simulations}
+    pending_tasks = {task.simulation_id: task for task in simulation_tasks}
+
+    num_workers = min(num_cpus, total)
+    logger.info(f"Setting up {total} Simulations")
+    logger.info(f"Total number of simulations to run: {total}. "
+                f"Total cores: {num_workers}")
     try:
-        processes = []
-        for index, batch in enumerate(simulation_batches):
-            process = Process(target=batch_processor,
-                              args=(batch, netlogo_model_path, index, q))
-            processes.append(process)
-            process.start()
-            logger.debug(f"Started batch {index + 1} with {len(batch)} simulations, "
-                         f"on processes: {process.pid}. {[sim['id'] for sim in batch]}")
         # used to track the progress of the simulations
-        prev_size = len(simulations) + 1
-        # used to print dots while waiting for the setting up to finish
-        dot = 0
+        remaining = total
+        prev_size = total
         pbar: PBar = PBar()
-        while any(p.is_alive() for p in processes):
-            size = q.qsize()
-
-            # print dots while waiting for the setting up to finish
-            if size == len(simulations):
-                dot = print_dots(dot, len(simulations))
-
-            # update the progress bar
-            if size < len(simulations) and size != prev_size:
-                prev_size = pbar.update(len(simulations), size, prev_size)
-
-        for process in processes:
-            process.join()
-
-        q.close()
-        pbar.close(len(simulations), size)
-        logger.info(f"\nFinished {len(simulations) - size} simulations.")
+        restarts = 0
+        while pending_tasks:
+            broken_error: Optional[BrokenProcessPool] = None
+            with ProcessPoolExecutor(max_workers=min(num_workers, len(pending_tasks)),
+                                     initializer=init_worker,
+                                     initargs=(netlogo_model_path, Value('i', 0))) as executor:
+                futures = [executor.submit(simulation_worker, task)
+                           for task in pending_tasks.values()]
+                for future in as_completed(futures):
+                    try:
+                        simulation_id, data = future.result()
+                    except BrokenProcessPool as e:
+                        broken_error = e
+                        continue
+                    del pending_tasks[simulation_id]
+                    remaining -= 1
+                    if data is not None:
+                        simulations_by_id[simulation_id].result.update(data)
+                        finished_simulation_ids.add(simulation_id)
+                    prev_size = pbar.update(total, remaining, prev_size)
+            if broken_error is None:
+                break
+            if restarts == MAX_EXECUTOR_RESTARTS:
+                # A simulation that kills its worker every time would otherwise never end
+                logger.error(f"Simulation workers died {restarts + 1} times, recording "
+                             f"{len(pending_tasks)} simulations as unsuccessful.")
+                finished_simulation_ids.update(pending_tasks)
+                remaining -= len(pending_tasks)
+                break
+            restarts += 1
+            # The executor runs the tasks in the order they are submitted, so the oldest
+            # unfinished ones were running when the worker died. Submitting them last lets
+            # the rest finish first, if one of them kills its worker every time.
+            for simulation_id in list(pending_tasks)[:num_workers + 1]:
+                pending_tasks[simulation_id] = pending_tasks.pop(simulation_id)
+            logger.error(f"A simulation worker died, restarting the workers for "
+                         f"{len(pending_tasks)} unfinished simulations. Exception: {broken_error}")
+
+        pbar.close(total, remaining)
+        logger.info(f"\nFinished {total - remaining} simulations.")
     except Exception as e:
         logger.error(f"Exception in parallel simulation: {e}")
+    return finished_simulation_ids
 
 
 def build_simulation_pool(scenarios: list[Scenario]) -> list[Simulation]:
@@ -349,6 +506,29 @@ def video_worker(args: tuple) -> None:
         logger.error(f"Error generating video for {simulation_id}. {e}")
 
 
+def build_feather_data(experiments_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the results of an experiment to the types they are loaded with from the csv,
+    so the feather and the csv files load into the same DataFrame.
+
+    The columns that hold None for the simulations without a result are cast to their
+    numeric types, and the list columns, such as robot_actions, are stored as text.
+
+    Args:
+        experiments_data: The data of all the simulations of the experiment.
+
+    Returns:
+        A copy of the data ready to be saved as feather.
+    """
+    feather_data = experiments_data.astype({column: dtype
+                                            for column, dtype in RESULTS_DTYPES.items()
+                                            if column in experiments_data.columns})
+    for column in feather_data.select_dtypes(include='object').columns:
+        if feather_data[column].map(lambda value: isinstance(value, list)).any():
+            feather_data[column] = feather_data[column].map(str, na_action='ignore')
+    return feather_data
+
+
 def save_simulations_results(scenarios: list[Scenario], experiment_folder: dict) -> None:
     """
     Gather the results from each simulation and saves a csv for each scenario, in their
@@ -363,13 +543,13 @@ def save_simulations_results(scenarios: list[Scenario], experiment_folder: dict)
     video_folder_path = experiment_folder['video']
 
     simulations_with_video: list[str] = []
-    # Combine all the results
-    experiments_data = pd.DataFrame()
+    scenarios_data: list[pd.DataFrame] = []
     for scenario in scenarios:
         simulations_with_video.extend(scenario.simulation_ids_with_video)
-        scenario_data = scenario.get_data()
-        experiments_data = pd.concat(
-            [experiments_data, scenario_data], ignore_index=True)
+        scenarios_data.append(scenario.get_data())
+    # Combine all the results at once, concatenating in the loop copies them every time
+    experiments_data = pd.concat(scenarios_data, ignore_index=True) if scenarios_data \
+        else pd.DataFrame()
 
     # Save the data
     try:
@@ -377,13 +557,21 @@ def save_simulations_results(scenarios: list[Scenario], experiment_folder: dict)
         experiments_data.to_csv(data_path)
     except Exception as e:
         logger.error(f"Error saving results file: {e}")
+    try:
+        build_feather_data(experiments_data).to_feather(
+            f"{data_folder_path}/{RESULTS_FEATHER_FILE_NAME}")
+    except Exception as e:
+        logger.error(f"Error saving feather results file: {e}")
 
     # save potential videos
     if simulations_with_video:
         logger.info(f"Generating videos for {simulations_with_video}")
         args_list = [(simulation_id, video_folder_path) for simulation_id in simulations_with_video]
-        with Pool(processes=get_available_cpus()) as pool:
-            pool.map(video_worker, args_list)
+        try:
+            with ProcessPoolExecutor(max_workers=get_available_cpus()) as executor:
+                list(executor.map(video_worker, args_list))
+        except BrokenProcessPool as e:
+            logger.error(f"A video worker died, the remaining videos were not generated. {e}")
 
 
 def log_execution_time(start_time: float, end_time: float) -> None:
@@ -391,29 +579,23 @@ def log_execution_time(start_time: float, end_time: float) -> None:
     logger.info(f"Experiment finished after {int(minutes)} minutes and {seconds:.2f} seconds")
 
 
-def update_simulations_pool(simulations_pool) -> list[Simulation]:
+def update_simulations_pool(simulations_pool: list[Simulation],
+                            finished_simulation_ids: set[str]) -> list[Simulation]:
     """
-    Queries the server for the list of unfinished simulations
-    and updates the next iteration of the simulations pool.
+    Updates the next iteration of the simulations pool with the unfinished simulations.
 
     Args:
-        simulations_pool: The previous iteration of the simulations pool.
+        simulations_pool: All the simulations of the experiment.
+        finished_simulation_ids: The ids of the simulations that have finished so far.
 
     Returns:
         new_pool: The updated simulations pool.
     """
-    responses = requests.get(BASE_URL + "/get_unfinished_simulations")
-    data = responses.json()
-    unfinished_simulations = data['ids']
-    unfinished_simulations = set(unfinished_simulations)
-
-    new_pool = []
-    for simulation in simulations_pool:
-        if simulation.id in unfinished_simulations:
-            new_pool.append(simulation)
+    new_pool = [simulation for simulation in simulations_pool
+                if simulation.id not in finished_simulation_ids]
 
     if len(new_pool) != len(simulations_pool) and len(new_pool) != 0:
-        logger.warning(f"An error prevented {len(unfinished_simulations)} simulations to execute. "
+        logger.warning(f"An error prevented {len(new_pool)} simulations to execute. "
                        f"Trying again...")
 
     return new_pool
@@ -439,10 +621,11 @@ def start_experiments(config: dict[str, Any],
     netlogo_model_path: str = config.get('netlogoModelPath', NETLOGO_FOLDER + "model.nlogo")
     simulations_pool = build_simulation_pool(scenarios)
     current_pool = simulations_pool[:]
+    finished_simulation_ids: set[str] = set()
     # Run the simulations until all are finished
     while current_pool:
-        execute_parallel_simulations(current_pool, netlogo_model_path)
-        current_pool = update_simulations_pool(simulations_pool)
+        finished_simulation_ids |= execute_parallel_simulations(current_pool, netlogo_model_path)
+        current_pool = update_simulations_pool(simulations_pool, finished_simulation_ids)
 
     save_simulations_results(scenarios, experiment_folder)
     end_time = time.time()
@@ -27,6 +27,37 @@ class HelpMatrixStrategy(AdaptationStrategy):
         [0.126, 0.063, 0.126, 0.168, 0.126, 0.168],
         [0.063, 0.0315, 0.063, 0.084, 0.063, 0.084]
     ]
+    # Helping chance above which the robot asks for help
+    helping_chance_threshold: float = 0.2
+
+    def __init__(self, scenario) -> None:
+        super().__init__(scenario)
+        # The action for each cell of the matrix, by the robot persuasion factor of self.scenario.
+        # Scenario.duplicate points the strategy to the new scenario, which may change the factor.
+        self.action_matrices: dict[float, list[list[str]]] = {}
+
+    def get_action_matrix(self, robot_persuasion_factor: float) -> list[list[str]]:
+        """
+        Returns the robot action for each helper and victim of the help matrix.
+
+        The actions are computed once for each robot persuasion factor.
+
+        Args:
+            robot_persuasion_factor: The multiplier of the helping chances.
+
+        Returns:
+            A matrix with the same rows and columns as the help matrix, with the robot actions.
+        """
+        action_matrix = self.action_matrices.get(robot_persuasion_factor)
+        if action_matrix is None:
+            action_matrix = [
+                [self.ASK_FOR_HELP_ROBOT_ACTION
+                 if helping_chance * robot_persuasion_factor > self.helping_chance_threshold
+                 else self.CALL_STAFF_ROBOT_ACTION
+                 for helping_chance in row]
+                for row in self.help_matrix]
+            self.action_matrices[robot_persuasion_factor] = action_matrix
+        return action_matrix
 
     def get_robot_action(self,
                          simulation_id: str,
@@ -54,11 +85,6 @@ class HelpMatrixStrategy(AdaptationStrategy):
         if victim.age == Age.ELDERLY.value:
             col += 2
 
-        helping_chance: float = self.help_matrix[row][col]
-        helping_chance *= self.scenario.netlogo_params.robot_persuasion_factor
-
-        threshold: float = 0.2
-        if helping_chance > threshold:
-            return self.ASK_FOR_HELP_ROBOT_ACTION
-        else:
-            return self.CALL_STAFF_ROBOT_ACTION
+        action_matrix = self.get_action_matrix(
+            self.scenario.netlogo_params.robot_persuasion_factor)
+        return action_matrix[row][col]
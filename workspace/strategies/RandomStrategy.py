@@ -7,13 +7,20 @@ class RandomStrategy(AdaptationStrategy):
     """
     Randomly choose between asking for help and calling staff.
     """
+    def __init__(self, scenario) -> None:
+        super().__init__(scenario)
+        # Own generator, seeded like the global one, so the draws of this strategy do not depend
+        # on other users of the global generator. Its bound method is cached for the hot path.
+        seed = scenario.netlogo_params.seed
+        self._random = random.Random(seed if seed != 0 else None).random
+
     def get_robot_action(self,
                          simulation_id: str,
                          candidate_helper: Survivor,
                          victim: Survivor,
                          helper_victim_distance: float,
                          first_responder_victim_distance: float) -> str:
-        if random.random() < 0.5:
+        if self._random() < 0.5:
             return self.ASK_FOR_HELP_ROBOT_ACTION
         else:
             return self.CALL_STAFF_ROBOT_ACTION
@@ -0,0 +1,62 @@
+"""
+Tests that the results of an experiment load with the same types from the feather
+and the csv files.
+
+Run from the workspace folder with: python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+
+import pandas as pd  # type: ignore
+from src.results_analysis import load_experiment_data
+from src.simulation_manager import build_feather_data
+from utils.paths import RESULTS_CSV_FILE_NAME, RESULTS_FEATHER_FILE_NAME
+
+
+def load_from_both_formats(experiments_data: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Saves the data as the experiment does, then loads it back from each file on its own.
+    """
+    with tempfile.TemporaryDirectory() as csv_folder, \
+            tempfile.TemporaryDirectory() as feather_folder:
+        experiments_data.to_csv(f"{csv_folder}/{RESULTS_CSV_FILE_NAME}")
+        build_feather_data(experiments_data).to_feather(
+            f"{feather_folder}/{RESULTS_FEATHER_FILE_NAME}")
+        return (load_experiment_data(csv_folder + '/'),
+                load_experiment_data(feather_folder + '/'))
+
+
+class TestResultsPersistence(unittest.TestCase):
+
+    def test_none_ticks_load_with_the_same_types(self):
+        experiments_data = pd.DataFrame({
+            'scenario': ['scenario_a', 'scenario_a', 'scenario_b'],
+            'evacuation_ticks': [120, None, 95],
+            'evacuation_time': [1.5, None, 2.25],
+            'robot_actions': [['ask-help'], [], ['call-staff', 'ask-help']],
+            'robot_contacts': [1, 0, 2],
+            'success': [True, False, True],
+        })
+        csv_data, feather_data = load_from_both_formats(experiments_data)
+
+        pd.testing.assert_series_equal(csv_data.dtypes, feather_data.dtypes)
+        self.assertEqual(feather_data['evacuation_ticks'].dtype, 'float64')
+        self.assertEqual(feather_data['robot_actions'].tolist(),
+                         csv_data['robot_actions'].tolist())
+
+    def test_all_none_ticks_load_with_the_same_types(self):
+        experiments_data = pd.DataFrame({
+            'scenario': ['scenario_a', 'scenario_b'],
+            'evacuation_ticks': [None, None],
+            'evacuation_time': [None, None],
+            'success': [False, False],
+        })
+        csv_data, feather_data = load_from_both_formats(experiments_data)
+
+        pd.testing.assert_series_equal(csv_data.dtypes, feather_data.dtypes)
+        self.assertEqual(feather_data['evacuation_ticks'].dtype, 'float64')
+
+
+if __name__ == '__main__':
+    unittest.main()
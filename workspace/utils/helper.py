@@ -55,6 +55,13 @@ def setup_logger() -> logging.Logger:
 
 logger = setup_logger()
 
+# Environment variable to limit the number of parallel simulations
+MAX_WORKERS_ENV_VARIABLE = "MAX_WORKERS"
+# Files with the CPU quota of the container for cgroup v2 and v1
+CGROUP_V2_CPU_MAX_FILE = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA_FILE = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD_FILE = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
 
 def convert_dict_to_snake_case(dictionary: dict[str, Any]) -> dict[str, Any]:
     """
@@ -104,14 +111,42 @@ def setup_folders() -> None:
             os.makedirs(path)
 
 
+def _get_cgroup_cpu_limit() -> Optional[int]:
+    """
+    Returns the CPU limit set by the cgroup quota of the container, if any.
+
+    Reads cpu.max for cgroup v2 and cpu.cfs_quota_us with cpu.cfs_period_us for cgroup v1.
+
+    Returns:
+        The number of CPUs allowed by the quota, rounded up, or None if there is no quota.
+    """
+    try:
+        with open(CGROUP_V2_CPU_MAX_FILE) as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        try:
+            with open(CGROUP_V1_CPU_QUOTA_FILE) as f:
+                quota = f.read().strip()
+            with open(CGROUP_V1_CPU_PERIOD_FILE) as f:
+                period = f.read().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    try:
+        return max(1, -(-int(quota) // int(period)))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
 def get_available_cpus() -> int:
     """
-    Returns the number of CPUs available in the system.
+    Returns the number of CPUs available to the process.
 
-    This function attempts to determine the number of CPUs available on the system
-    using the `cpu_count()` function from the `multiprocessing` module. If the
-    number of CPUs cannot be determined, it returns 1 as a fallback and will run
-    simulations sequentially.
+    This function counts the CPUs the process is allowed to run on, which may be fewer than
+    the CPUs of the system, and caps them by the cgroup CPU quota of the container and by the
+    MAX_WORKERS environment variable, if set. If the number of CPUs cannot be determined,
+    it returns 1 as a fallback and will run simulations sequentially.
 
     Note:
         Docker will need to use some of the cores available on the system. This may
@@ -121,10 +156,23 @@ def get_available_cpus() -> int:
         The number of available CPUs.
     """
     try:
-        num_cpus = cpu_count()  # type: int
+        if hasattr(os, 'sched_getaffinity'):
+            num_cpus = len(os.sched_getaffinity(0))
+        else:
+            num_cpus = cpu_count()  # type: int
+        cgroup_cpu_limit = _get_cgroup_cpu_limit()
+        if cgroup_cpu_limit is not None:
+            num_cpus = min(num_cpus, cgroup_cpu_limit)
     except Exception as e:
         num_cpus = 1
         logger.error(f"Exception in getting number of CPUs. 1 used. : {e}")
+
+    max_workers = os.environ.get(MAX_WORKERS_ENV_VARIABLE)
+    if max_workers:
+        try:
+            num_cpus = min(num_cpus, max(1, int(max_workers)))
+        except ValueError:
+            logger.warning(f"Invalid {MAX_WORKERS_ENV_VARIABLE} value: {max_workers}, ignored.")
     return num_cpus
 
 
@@ -152,28 +200,6 @@ class TimeoutException(Exception):
     pass
 
 
-def timeout_handler(signum, frame) -> None:
-    raise TimeoutException
-
-
-def print_dots(dot, total):
-    """ Print dots to show progress. """
-    time = 10000
-    interval = 5
-    dot += 1
-    if dot == time:
-        logger.info(f"\033[A\033[KSetting up {total} Simulations\r")
-    elif dot == time * interval:
-        logger.info(f"\033[A\033[KSetting up {total} Simulations..\r")
-    elif dot == time * interval * 2:
-        logger.info(f"\033[A\033[KSetting up {total} Simulations....\r")
-    elif dot == time * interval * 3:
-        logger.info(f"\033[A\033[KSetting up {total} Simulations......\r")
-    elif dot > time * interval * 4:
-        dot = 0
-    return dot
-
-
 class PBar():
     def __init__(self):
         self.pbar = None
@@ -5,7 +5,11 @@ NetLogo commands and reporters used in the simulation
 NETLOGO_VERSION = "5"
 
 SEED_SIMULATION_REPORTER = "seed-simulation {}"
+SETUP_SIMULATION_REPORTER = "setup-simulation {}"
 EVACUATION_FINISHED_REPORTER = "evacuation-finished?"
+GO_TICKS_REPORTER = "go-ticks {}"
+
+CLEAR_COMMAND = "clear"
 
 SET_SIMULATION_ID_COMMAND = 'set SIMULATION_ID "{}"'
 SET_FALL_LENGTH_COMMAND = "set DEFAULT_FALL_LENGTH {}"
@@ -30,6 +30,8 @@ CONFIG_FILE = WORKSPACE_FOLDER + 'config.json'
 # Folder name for the directory to save the results of the current experiment
 EXPERIMENT_FOLDER_NAME = None
 RESULTS_CSV_FILE_NAME = "experiment_data.csv"
+# Same results in a binary format that is much faster to load for the analysis
+RESULTS_FEATHER_FILE_NAME = "experiment_data.feather"
 
 
 def get_experiment_folder_name():
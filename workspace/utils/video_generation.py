@@ -4,11 +4,69 @@ This module provides functionality for generating GIF animations from simulation
 
 
 import glob
+from typing import Iterator
 
 import natsort  # type: ignore
 from PIL import Image, ImageDraw  # type: ignore
 from utils.paths import FRAMES_FOLDER
 
+# Number of frames, spread across the simulation, the shared palette is computed from
+PALETTE_SAMPLE_FRAMES = 8
+# Colour of the tick label drawn on the frames, always kept in the palette
+LABEL_COLOR = (0, 0, 0)
+
+
+def build_palette(frame_list: list[str]) -> Image.Image:
+    """ Builds a palette shared by all the frames of a simulation.
+
+    The palette is computed from frames sampled evenly across the simulation, so it holds
+    the colours the agents only take midway, instead of computing an adaptive palette for
+    every frame when the GIF is saved. Its last colour is reserved for the tick labels,
+    which are not drawn on the sampled frames.
+
+    Args:
+        frame_list: The paths to the frames, sorted by tick.
+
+    Returns:
+        A palette image to quantize the frames with.
+    """
+    number_of_samples = min(PALETTE_SAMPLE_FRAMES, len(frame_list))
+    last_index = len(frame_list) - 1
+    sample_indices = sorted({round(i * last_index / max(1, number_of_samples - 1))
+                             for i in range(number_of_samples)})
+    sampled_frames = []
+    for index in sample_indices:
+        with Image.open(frame_list[index]) as frame:
+            sampled_frames.append(frame.convert('RGB'))
+    width = max(frame.width for frame in sampled_frames)
+    sample = Image.new('RGB', (width, sum(frame.height for frame in sampled_frames)))
+    top = 0
+    for frame in sampled_frames:
+        sample.paste(frame, (0, top))
+        top += frame.height
+    palette = sample.quantize(colors=255)
+    palette.putpalette(palette.getpalette()[:255 * 3] + list(LABEL_COLOR))
+    return palette
+
+
+def label_frames(frame_list: list[str], palette: Image.Image) -> Iterator[Image.Image]:
+    """ Opens the frame files of a simulation one at a time and labels the frames with their tick.
+
+    Args:
+        frame_list: The paths to the frames, sorted by tick.
+        palette: The palette image the frames are quantized with.
+
+    Yields:
+        The labelled frame images.
+    """
+    for i, frame_file in enumerate(frame_list):
+        with Image.open(frame_file) as frame:
+            frame_as_image = frame.convert('RGB')
+        draw = ImageDraw.Draw(frame_as_image)
+        label = f'tick:{i}'
+        draw.text((10, 10), label, fill=LABEL_COLOR)
+        yield frame_as_image.quantize(palette=palette, dither=Image.Dither.NONE)
+
 
 def generate_video(simulation_id: str, video_path: str, frame_duration: int = 200) -> None:
     """ Generates a GIF animation from the frames of a simulation.
@@ -30,16 +88,14 @@ def generate_video(simulation_id: str, video_path: str, frame_duration: int = 20
         return
 
     print("Generating GIF from {} frames for simulation {}".format(number_of_frames, simulation_id))
-    frames = []
-    for i, frame_file in enumerate(frame_list):
-        frame_as_image = Image.open(frame_file)
-        frames.append(frame_as_image)
-        draw = ImageDraw.Draw(frame_as_image)
-        label = f'tick:{i}'
-        draw.text((10, 10), label, fill='black')
+    # Each frame file is opened and closed in turn, instead of holding all of them open.
+    # Pillow still keeps every labelled frame in memory until the GIF is written.
+    frames = label_frames(frame_list, build_palette(frame_list))
 
     output_file = video_path + f"/video_{simulation_id}.gif"
-    first_frame = frames[0]
+    first_frame = next(frames)
+    # Without a palette in the save arguments, Pillow optimizes the palette of every frame by
+    # default, remapping them all, while the frames already share one
     first_frame.save(output_file, format="GIF", append_images=frames,
-                     save_all=True, duration=frame_duration)
+                     save_all=True, duration=frame_duration, optimize=False)
     print("Animation generated at {}".format(output_file))